@@ -1,8 +1,17 @@
-from project_logic.predict import load_image_model_trained, load_tabular_model_trained, predict_tabular, predict_image
-from project_logic.preprocessing import TabularInput
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from project_logic.predict import load_image_model_trained, load_tabular_model_trained, predict_tabular, predict_image, predict_tabular_batch
+from project_logic.preprocessing import TabularInput, missing_tabular_columns, mistyped_tabular_columns, iter_arrow_batches, read_npy_header, iter_npy_batches
+from project_logic.video import score_video, DEFAULT_SAMPLE_FPS, DEFAULT_SEGMENT_SECONDS
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import tempfile
+import shutil
+import io
+import os
 
 
 
@@ -11,6 +20,7 @@ app = FastAPI()
 print('✅ Fast API initialized')
 
 # Pre-load trained models (image, tabular) into app.state
+# The image model is compiled and warmed up for every batch-size bucket before MODEL_READY
 app.state.image_model = load_image_model_trained()
 app.state.tabular_model = load_tabular_model_trained()
 
@@ -64,6 +74,43 @@ async def predict_image_api(image_file: UploadFile= File(...)):
         "model_ready": True
     }
 
+# Video predict endpoint for https://our-domain.com/predict/video
+# Sync def: FastAPI runs it in a worker thread, so long videos don't block the event loop
+@app.post("/predict/video")
+def predict_video_api(video_file: UploadFile = File(...),
+                      sample_fps: float = DEFAULT_SAMPLE_FPS,
+                      segment_seconds: float = DEFAULT_SEGMENT_SECONDS):
+
+    # Make sure it's a video
+    if not video_file.content_type.startswith("video/"):
+        raise HTTPException(status_code=400, detail="File must be a video")
+    if sample_fps <= 0 or segment_seconds <= 0:
+        raise HTTPException(status_code=400, detail="sample_fps and segment_seconds must be positive")
+
+    # OpenCV decodes from a path, so copy the upload to disk in chunks
+    suffix = os.path.splitext(video_file.filename or "")[1]
+    with tempfile.NamedTemporaryFile(suffix=suffix) as video_tmp:
+        shutil.copyfileobj(video_file.file, video_tmp)
+        video_tmp.flush()
+
+        try:
+            result = score_video(
+                model=app.state.image_model,
+                video_path=video_tmp.name,
+                sample_fps=sample_fps,
+                segment_seconds=segment_seconds,
+            )
+        except ValueError:
+            # Report the client's filename, not the server-side temp path
+            raise HTTPException(status_code=400, detail=f"Could not open video {video_file.filename}")
+
+    return {
+        "prediction": result["timeline"],
+        "stats": result["stats"],
+        "inputs": {"filename": video_file.filename},
+        "model_ready": True
+    }
+
 # Tabular predict endpoint for https://our-domain.com/predict/tabular
 @app.post("/predict/tabular")
 def predict_tabular_api(payload: TabularInput):
@@ -81,3 +128,137 @@ def predict_tabular_api(payload: TabularInput):
         "inputs": X_pred.to_dict(orient="records")[0],
         "model_ready": True
 }
+
+
+# Binary batch endpoint for https://our-domain.com/predict/tabular/batch
+ARROW_STREAM_TYPE = "application/vnd.apache.arrow.stream"
+NPY_TYPE = "application/x-npy"
+
+# Request bodies above this size are spooled to disk instead of memory
+SPOOL_MAX_BYTES = 64 * 1024 * 1024
+BATCH_CHUNK_ROWS = 65536
+
+PROBA_SCHEMA = pa.schema([
+    ("probability_bleached", pa.float32()),
+    ("probability_unbleached", pa.float32()),
+])
+ARROW_EOS = b"\xff\xff\xff\xff\x00\x00\x00\x00"
+
+
+def _arrow_response_stream(frames, body):
+    """
+    Score each chunk as it is decoded and emit it as one Arrow record batch
+    """
+    try:
+        yield PROBA_SCHEMA.serialize().to_pybytes()
+        for X_pred in frames:
+            prob_unbleached = predict_tabular_batch(app.state.tabular_model, X_pred)
+            batch = pa.record_batch(
+                [pa.array(1 - prob_unbleached), pa.array(prob_unbleached)],
+                schema=PROBA_SCHEMA,
+            )
+            yield batch.serialize().to_pybytes()
+        yield ARROW_EOS
+    finally:
+        body.close()
+
+
+def _npy_response_stream(frames, n_rows, body):
+    """
+    Emit a (n_rows, 2) float32 .npy array [bleached, unbleached], chunk by chunk
+    """
+    try:
+        header = io.BytesIO()
+        np.lib.format.write_array_header_1_0(
+            header, {"descr": "<f4", "fortran_order": False, "shape": (n_rows, 2)}
+        )
+        yield header.getvalue()
+        for X_pred in frames:
+            prob_unbleached = predict_tabular_batch(app.state.tabular_model, X_pred)
+            yield np.column_stack([1 - prob_unbleached, prob_unbleached]).astype("<f4").tobytes()
+    finally:
+        body.close()
+
+
+def _arrow_kind(arrow_type):
+    # Map an Arrow type to the numpy dtype kind checked by mistyped_tabular_columns
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return "U"
+    if pa.types.is_integer(arrow_type) or pa.types.is_floating(arrow_type):
+        return np.dtype(arrow_type.to_pandas_dtype()).kind
+    return "O"
+
+
+def _check_tabular_fields(names, kinds):
+    missing = missing_tabular_columns(names)
+    if missing:
+        raise ValueError(f"missing tabular features {missing}")
+
+    mistyped = mistyped_tabular_columns(kinds)
+    if mistyped:
+        raise ValueError(
+            f"wrong type for tabular features {mistyped}: Realm_Name and Ocean_Name "
+            "must be strings (unicode 'U' fields in .npy), all other features numeric"
+        )
+
+
+def _open_batch_payload(body, content_type):
+    """
+    Validate the spooled request body in full and return the response generator.
+    Raises ValueError / pa.ArrowInvalid on bad input, before any response is sent.
+    """
+    if content_type == ARROW_STREAM_TYPE:
+        reader = pa.ipc.open_stream(body)
+        schema = reader.schema
+        _check_tabular_fields(
+            schema.names, {field.name: _arrow_kind(field.type) for field in schema}
+        )
+
+        # Read every batch once so truncated or corrupt streams fail here rather than mid-response
+        try:
+            for _ in reader:
+                pass
+        except OSError as e:
+            raise ValueError(f"truncated or corrupt Arrow stream ({e})")
+        body.seek(0)
+
+        frames = iter_arrow_batches(pa.ipc.open_stream(body), chunk_rows=BATCH_CHUNK_ROWS)
+        return _arrow_response_stream(frames, body)
+
+    shape, dtype = read_npy_header(body)
+    _check_tabular_fields(dtype.names, {name: dtype[name].kind for name in dtype.names})
+
+    frames = iter_npy_batches(body, dtype, shape[0], chunk_rows=BATCH_CHUNK_ROWS)
+    return _npy_response_stream(frames, shape[0], body)
+
+
+@app.post("/predict/tabular/batch")
+async def predict_tabular_batch_api(request: Request):
+    """
+    Score many rows sent as an Arrow IPC stream or a structured .npy array.
+    The request body is buffered in full (spooled to disk past SPOOL_MAX_BYTES) and
+    validated before scoring; the response uses the same format and is streamed back chunk by chunk.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type not in (ARROW_STREAM_TYPE, NPY_TYPE):
+        raise HTTPException(
+            status_code=415,
+            detail=f"Content-Type must be {ARROW_STREAM_TYPE} or {NPY_TYPE}",
+        )
+
+    # Spooled file writes and validation may hit disk, so keep them off the event loop
+    body = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    try:
+        async for chunk in request.stream():
+            await run_in_threadpool(body.write, chunk)
+        body.seek(0)
+
+        response_stream = await run_in_threadpool(_open_batch_payload, body, content_type)
+    except (ValueError, pa.ArrowInvalid) as e:
+        body.close()
+        raise HTTPException(status_code=400, detail=f"Invalid payload: {e}")
+    except BaseException:
+        body.close()
+        raise
+
+    return StreamingResponse(response_stream, media_type=content_type)
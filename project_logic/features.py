@@ -0,0 +1,156 @@
+import numpy as np
+
+
+#-----------------------THERMAL_STRESS_CONSTANTS-------------------
+
+# Degree Heating Weeks accumulate HotSpots over a trailing 12-week window
+DHW_WINDOW_DAYS = 84
+HOTSPOT_THRESHOLD = 1.0
+
+# Date_Year mean/std of the training data, used to build year_norm.
+# coral_bleaching_tabular_pipe.ipynb, "encoding time features" cell (execution count 28), computes
+# num_cols_df["Date_Year"].mean() / .std() on the Kaggle "coral-reef-global-bleaching" dataset
+# (global_bleaching_environmental.csv) after dropna on Percent_Bleaching and drop_duplicates.
+# The notebook never saved them, so they are solved back from its df.head() output
+# (year_norm -0.670919 for 2005, -3.118690 for 1991); re-derive them if the model is retrained.
+YEAR_MEAN = 2008.837
+YEAR_STD = 5.7195
+
+
+#-----------------------TIME_FEATURES-------------------
+
+def time_features(dates):
+    """
+    Derive month_sin, month_cos and year_norm from an array of dates
+    (anything np.asarray can turn into datetime64)
+    """
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    month = dates.astype("datetime64[M]").astype(int) % 12 + 1
+    year = dates.astype("datetime64[Y]").astype(int) + 1970
+
+    return {
+        "month_sin": np.sin(2 * np.pi * month / 12),
+        "month_cos": np.cos(2 * np.pi * month / 12),
+        "year_norm": (year - YEAR_MEAN) / YEAR_STD,
+    }
+
+
+#-----------------------THERMAL_STRESS_FEATURES-------------------
+
+def _hotspots(anomaly):
+    # Only anomalies at or above the threshold count towards DHW; missing days count as 0
+    hotspots = np.where(anomaly >= HOTSPOT_THRESHOLD, anomaly, 0.0)
+    return np.nan_to_num(hotspots, nan=0.0)
+
+
+def _daily_climatology(clim_sst, n_sites, n_days):
+    # Accept a per-day climatology (n_sites, n_days) or one constant value per site (n_sites,)
+    clim_sst = np.asarray(clim_sst, dtype=np.float64)
+    if clim_sst.ndim == 1:
+        clim_sst = clim_sst[:, None]
+    return np.broadcast_to(clim_sst, (n_sites, n_days))
+
+
+def thermal_stress_features(sst, clim_sst, mmm, dates):
+    """
+    Compute SSTA, SSTA_DHW, TSA, TSA_DHW and the time features for every site and day.
+
+    sst: daily SST, shape (n_sites, n_days)
+    clim_sst: climatological SST for every site and day, shape (n_sites, n_days),
+        or one constant value per site, shape (n_sites,)
+    mmm: maximum monthly mean SST per site, shape (n_sites,)
+    dates: the n_days dates shared by all sites
+
+    Returns a dict of arrays of shape (n_sites, n_days), keyed by TabularInput field name.
+    DHW values use partial windows for the first 12 weeks of the series.
+    """
+    sst = np.atleast_2d(np.asarray(sst, dtype=np.float64))
+    n_sites, n_days = sst.shape
+
+    ssta = sst - _daily_climatology(clim_sst, n_sites, n_days)
+    tsa = sst - np.asarray(mmm, dtype=np.float64)[:, None]
+
+    # Trailing rolling sum over the window via a cumulative sum along the day axis
+    hotspots = np.stack([_hotspots(ssta), _hotspots(tsa)])
+    cumulative = np.cumsum(hotspots, axis=-1)
+    dhw = cumulative.copy()
+    dhw[..., DHW_WINDOW_DAYS:] -= cumulative[..., :-DHW_WINDOW_DAYS]
+    dhw /= 7
+
+    features = {
+        "SSTA": ssta,
+        "SSTA_DHW": dhw[0],
+        "TSA": tsa,
+        "TSA_DHW": dhw[1],
+    }
+    for name, values in time_features(dates).items():
+        features[name] = np.broadcast_to(values, (n_sites, n_days))
+
+    return features
+
+
+class ThermalStressEngine:
+    """
+    Keeps the trailing 12 weeks of HotSpots for many sites so that adding one
+    day of SST costs O(1) per site instead of recomputing the whole window.
+    """
+
+    def __init__(self, mmm):
+        self.mmm = np.asarray(mmm, dtype=np.float64)
+        n_sites = self.mmm.shape[0]
+
+        # Ring buffer of daily HotSpots, [0] for SSTA and [1] for TSA
+        self._ring = np.zeros((2, n_sites, DHW_WINDOW_DAYS))
+        self._running = np.zeros((2, n_sites))
+        self._pos = 0
+
+    @classmethod
+    def from_history(cls, sst, clim_sst, mmm):
+        """
+        Build an engine already warmed up with a (n_sites, n_days) SST history
+        and its climatology (same shapes as in thermal_stress_features)
+        """
+        engine = cls(mmm)
+        sst = np.atleast_2d(np.asarray(sst, dtype=np.float64))
+
+        hotspots = np.stack([
+            _hotspots(sst - _daily_climatology(clim_sst, *sst.shape)),
+            _hotspots(sst - engine.mmm[:, None]),
+        ])[..., -DHW_WINDOW_DAYS:]
+
+        n_days = hotspots.shape[-1]
+        engine._ring[..., :n_days] = hotspots
+        engine._pos = n_days % DHW_WINDOW_DAYS
+        engine._running = engine._ring.sum(axis=-1)
+
+        return engine
+
+    def update(self, sst, clim_sst, date):
+        """
+        Add one day of SST and that day's climatological SST (both shape (n_sites,))
+        and return that day's features, keyed by TabularInput field name
+        """
+        sst = np.asarray(sst, dtype=np.float64)
+        ssta = sst - np.asarray(clim_sst, dtype=np.float64)
+        tsa = sst - self.mmm
+
+        hotspots = np.stack([_hotspots(ssta), _hotspots(tsa)])
+        self._running += hotspots - self._ring[..., self._pos]
+        self._ring[..., self._pos] = hotspots
+        self._pos = (self._pos + 1) % DHW_WINDOW_DAYS
+
+        # Re-sum once per window so floating-point drift cannot build up
+        if self._pos == 0:
+            self._running = self._ring.sum(axis=-1)
+
+        features = {
+            "SSTA": ssta,
+            "SSTA_DHW": self._running[0] / 7,
+            "TSA": tsa,
+            "TSA_DHW": self._running[1] / 7,
+        }
+        n_sites = sst.shape[0]
+        for name, values in time_features([date]).items():
+            features[name] = np.full(n_sites, values[0])
+
+        return features
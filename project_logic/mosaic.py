@@ -0,0 +1,247 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import rasterio
+from rasterio.windows import Window
+
+from project_logic.predict import IMAGE_SHAPE
+
+
+#-----------------------MOSAIC_SETTINGS-------------------
+
+TILE_SIZE = IMAGE_SHAPE[0]
+DEFAULT_TILE_STRIDE = 168          # 56 px overlap between neighbouring tiles
+MOSAIC_BATCH_SIZE = 32
+MOSAIC_WORKERS = 4
+
+# Pre-filter: tiles that are mostly nodata or almost textureless (open water, sand, padding) are skipped.
+# Thresholds are in 8-bit units, which is also what the image model was trained on.
+MAX_NODATA_FRACTION = 0.9
+MIN_TEXTURE_STD = 6.0
+
+
+#-----------------------WINDOWED_READERS-------------------
+
+class _RasterMosaic:
+    """
+    Windowed reads through rasterio (8-bit GeoTIFF and anything else GDAL can open).
+    Nodata comes from the dataset mask (nodata value, alpha band or internal mask).
+    Each worker thread gets its own dataset handle, since handles are not thread-safe.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._handles = []
+        self._lock = threading.Lock()
+        with rasterio.open(path) as src:
+            self.height, self.width = src.height, src.width
+            self.bands = [1, 2, 3] if src.count >= 3 else [1, 1, 1]
+            dtypes = {src.dtypes[band - 1] for band in self.bands}
+
+        if dtypes != {"uint8"}:
+            raise ValueError(
+                f"Only 8-bit mosaics are supported, got {sorted(dtypes)}; "
+                "rescale first, e.g. gdal_translate -ot Byte -scale"
+            )
+
+    def read(self, row, col, size):
+        """
+        Return (tile, valid): a (size, size, 3) uint8 tile and a (size, size) mask
+        that is False for nodata and for padding past the mosaic edge
+        """
+        if not hasattr(self._local, "src"):
+            self._local.src = rasterio.open(self.path)
+            with self._lock:
+                self._handles.append(self._local.src)
+
+        # Boundless reads are an order of magnitude slower, so only edge tiles use them
+        window = Window(col, row, size, size)
+        boundless = row + size > self.height or col + size > self.width
+        tile = self._local.src.read(self.bands, window=window, boundless=boundless, fill_value=0)
+        valid = self._local.src.dataset_mask(window=window, boundless=boundless) > 0
+        return np.moveaxis(tile, 0, -1), valid
+
+    def close(self):
+        for src in self._handles:
+            src.close()
+
+
+class _NpyMosaic:
+    """
+    Windowed reads from a memory-mapped (height, width, channels) uint8 .npy array,
+    with 1 (grayscale, repeated into RGB), 3 (RGB) or 4 (RGB + alpha) channels.
+    The alpha channel is the mask when present; otherwise padding and all-zero
+    pixels count as nodata.
+    """
+
+    def __init__(self, path):
+        self.array = np.load(path, mmap_mode="r")
+        if self.array.dtype != np.uint8 or self.array.ndim != 3 or self.array.shape[2] not in (1, 3, 4):
+            raise ValueError(
+                "Expected a (height, width, 1|3|4) uint8 array, "
+                f"got {self.array.dtype} {self.array.shape}"
+            )
+        self.height, self.width = self.array.shape[:2]
+
+    def read(self, row, col, size):
+        tile = np.zeros((size, size, 3), dtype=np.uint8)
+        window = self.array[row:row + size, col:col + size]
+        tile[:window.shape[0], :window.shape[1]] = window[..., :3]
+
+        if window.shape[2] == 4:
+            valid = np.zeros((size, size), dtype=bool)
+            valid[:window.shape[0], :window.shape[1]] = window[..., 3] > 0
+        else:
+            valid = np.any(tile != 0, axis=-1)
+        return tile, valid
+
+    def close(self):
+        pass
+
+
+def open_mosaic(path: str):
+    if path.endswith(".npy"):
+        return _NpyMosaic(path)
+    return _RasterMosaic(path)
+
+
+#-----------------------TILING-------------------
+
+def is_background_tile(tile, valid) -> bool:
+    """
+    Cheap pre-filter on a 4x-subsampled tile: True for blank/nodata or water-only tiles
+    """
+    sample_valid = valid[::4, ::4]
+    if 1 - sample_valid.mean() > MAX_NODATA_FRACTION:
+        return True
+
+    gray = tile[::4, ::4][sample_valid].astype(np.float32).mean(axis=-1)
+    return gray.std() < MIN_TEXTURE_STD
+
+
+def _cell_block(grid_index, n_cells, stride):
+    """
+    Tile-relative slice of the heatmap cell a tile stands for: its central
+    stride-wide block, stretched to the mosaic edge for the first and last tile
+    """
+    offset = max((TILE_SIZE - stride) // 2, 0)
+    start = 0 if grid_index == 0 else offset
+    stop = TILE_SIZE if grid_index == n_cells - 1 else min(offset + stride, TILE_SIZE)
+    return slice(start, stop)
+
+
+def _read_tile_batch(mosaic, positions):
+    # Runs in a worker thread: read and pre-filter one batch of tiles
+    kept_positions, kept_tiles, kept_valid_px = [], [], []
+    for grid_row, grid_col, row, col, block in positions:
+        tile, valid = mosaic.read(row, col, TILE_SIZE)
+        if is_background_tile(tile, valid):
+            continue
+
+        # Nodata pixels (e.g. a 255 nodata value) reach the model as black, like edge padding
+        tile[~valid] = 0
+        kept_positions.append((grid_row, grid_col))
+        kept_tiles.append(tile.astype(np.float32))
+        kept_valid_px.append(int(valid[block].sum()))
+    return kept_positions, kept_tiles, kept_valid_px, len(positions) - len(kept_positions)
+
+
+def _iter_position_batches(n_rows, n_cols, stride, batch_size):
+    batch = []
+    for grid_row in range(n_rows):
+        for grid_col in range(n_cols):
+            block = (_cell_block(grid_row, n_rows, stride), _cell_block(grid_col, n_cols, stride))
+            batch.append((grid_row, grid_col, grid_row * stride, grid_col * stride, block))
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+#-----------------------MOSAIC_SCORING-------------------
+
+def _score_tile_batch(model, tile_batch, heatmap, cell_area, stats):
+    kept_positions, kept_tiles, kept_valid_px, n_skipped = tile_batch
+    if kept_tiles:
+        prob_unbleached = np.asarray(model.predict(np.stack(kept_tiles))).reshape(-1)
+        for (grid_row, grid_col), prob, valid_px in zip(kept_positions, prob_unbleached, kept_valid_px):
+            heatmap[grid_row, grid_col] = 1 - prob
+            cell_area[grid_row, grid_col] = valid_px
+
+    stats["tiles_scored"] += len(kept_tiles)
+    stats["tiles_skipped_background"] += n_skipped
+
+
+def score_mosaic(model=None,
+                 mosaic_path: str = None,
+                 stride: int = DEFAULT_TILE_STRIDE,
+                 batch_size: int = MOSAIC_BATCH_SIZE,
+                 workers: int = MOSAIC_WORKERS):
+    """
+    Score a large reef orthomosaic tile by tile with the image model.
+
+    Overlapping 224x224 tiles are read in windows by a worker pool, background tiles
+    are skipped, and the rest are batched through the model. At most `workers` batches
+    of tiles are in memory at once, whatever the mosaic size.
+
+    Returns a heatmap of probability_bleached with one cell per tile, standing for the
+    stride x stride block at the tile's centre (NaN where the tile was skipped), plus a
+    summary weighted by the valid (non-nodata) pixels in each cell.
+    """
+    start = time.perf_counter()
+    mosaic = open_mosaic(mosaic_path)
+
+    n_rows = max(int(np.ceil((mosaic.height - TILE_SIZE) / stride)) + 1, 1)
+    n_cols = max(int(np.ceil((mosaic.width - TILE_SIZE) / stride)) + 1, 1)
+    heatmap = np.full((n_rows, n_cols), np.nan, dtype=np.float32)
+    # Valid pixels in each scored cell, so nodata and padding carry no weight in the summary
+    cell_area = np.zeros((n_rows, n_cols), dtype=np.float64)
+
+    stats = {"tiles_scored": 0, "tiles_skipped_background": 0}
+
+    # Workers read and pre-filter tile batches while the model scores the oldest one
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for positions in _iter_position_batches(n_rows, n_cols, stride, batch_size):
+                pending.append(pool.submit(_read_tile_batch, mosaic, positions))
+                if len(pending) >= workers:
+                    _score_tile_batch(model, pending.popleft().result(), heatmap, cell_area, stats)
+
+            while pending:
+                _score_tile_batch(model, pending.popleft().result(), heatmap, cell_area, stats)
+    finally:
+        mosaic.close()
+
+    scored = ~np.isnan(heatmap)
+    scored_area = cell_area[scored].sum()
+
+    if scored_area:
+        mean_prob_bleached = float((heatmap[scored] * cell_area[scored]).sum() / scored_area)
+        percent_bleached = float(cell_area[scored & (heatmap >= 0.5)].sum() / scored_area * 100)
+    else:
+        mean_prob_bleached = percent_bleached = None
+
+    elapsed = time.perf_counter() - start
+    n_tiles = stats["tiles_scored"] + stats["tiles_skipped_background"]
+    stats["elapsed_s"] = elapsed
+    stats["tiles_per_s"] = n_tiles / elapsed if elapsed else 0.0
+
+    print('✅ Mosaic prediction ready')
+
+    return {
+        "heatmap": heatmap,
+        "summary": {
+            "percent_bleached": percent_bleached,
+            "mean_probability_bleached": mean_prob_bleached,
+            "scored_area_px": int(scored_area),
+            "mosaic_area_px": int(mosaic.height) * int(mosaic.width),
+        },
+        "stats": stats,
+    }
+
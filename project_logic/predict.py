@@ -1,4 +1,5 @@
 from tensorflow.keras.models import load_model
+import tensorflow as tf
 import numpy as np
 import pandas as pd
 import dill
@@ -10,13 +11,71 @@ from project_logic.preprocessing import load_img
 from project_logic.preprocessing import preprocess_tabular
 
 
+#-----------------------COMPILED_IMAGE_MODEL-------------------
+
+IMAGE_SHAPE = (224, 224, 3)
+IMAGE_BATCH_BUCKETS = (1, 4, 16, 32)
+
+
+class CompiledImageModel:
+    """
+    Keras image model wrapped in a tf.function traced once per batch-size bucket.
+    Batches are zero-padded up to the nearest bucket, so no request ever retraces.
+    Exposes .predict like the Keras model, so predict_image works with either.
+    """
+
+    def __init__(self, model, buckets=IMAGE_BATCH_BUCKETS, jit_compile=False):
+        self.model = model
+        self.buckets = tuple(sorted(buckets))
+
+        infer = tf.function(lambda images: model(images, training=False), jit_compile=jit_compile)
+        self._infer_fns = {
+            bucket: infer.get_concrete_function(tf.TensorSpec((bucket, *IMAGE_SHAPE), tf.float32))
+            for bucket in self.buckets
+        }
+
+    def warmup(self):
+        # First calls still pay kernel selection / XLA compilation, so run them before serving
+        for bucket, infer_fn in self._infer_fns.items():
+            infer_fn(tf.zeros((bucket, *IMAGE_SHAPE)))
+        print('✅ Image_Model warmed up for batch sizes', self.buckets)
+
+    def predict(self, images):
+        images = np.asarray(images, dtype=np.float32)
+        if len(images) == 0:
+            # Match Keras predict on an empty batch
+            return np.zeros((0, 1), np.float32)
+
+        largest = self.buckets[-1]
+
+        outputs = []
+        for start in range(0, len(images), largest):
+            chunk = images[start:start + largest]
+            n_images = len(chunk)
+            bucket = next(b for b in self.buckets if b >= n_images)
+            if bucket > n_images:
+                padding = np.zeros((bucket - n_images, *IMAGE_SHAPE), dtype=np.float32)
+                chunk = np.concatenate([chunk, padding])
+
+            outputs.append(np.asarray(self._infer_fns[bucket](chunk))[:n_images])
+
+        return np.concatenate(outputs)
+
+
 #-----------------------MODEL_LOADING-------------------
 
 
-def load_image_model_trained():
+def load_image_model_trained(compiled=True):
     model_path = os.path.join("models", "baseline_model.keras")
     image_model = load_model(model_path)
     print('✅ Image_Model_loaded')
+
+    if compiled:
+        # IMAGE_MODEL_XLA=true turns on XLA JIT for the compiled graph
+        jit_compile = os.environ.get("IMAGE_MODEL_XLA", "false").lower() == "true"
+        image_model = CompiledImageModel(image_model, jit_compile=jit_compile)
+        image_model.warmup()
+
     return image_model
 
 
@@ -30,6 +89,10 @@ def load_tabular_model_trained():
 
 #-----------------------PREDICTION--------------------------
 
+# Tabular training target encoding (coral_bleaching_tabular_pipe.ipynb): {'healthy': 0, 'bleached': 1}
+TABULAR_UNBLEACHED_LABEL = 0
+
+
 def predict_image(model=None, image_bytes=None):
     """
     Make a bleaching prediction using the latest trained CNN/VGG16 model
@@ -87,3 +150,22 @@ def predict_tabular(model=None, X_pred: pd.DataFrame = None):
         "probability_bleached": prob_bleached,
         "probability_unbleached": prob_unbleached
     }
+
+
+def predict_tabular_batch(model=None, X_pred: pd.DataFrame = None):
+    """
+    Score many rows at once with the tabular model.
+    Returns a float32 array of unbleached probabilities, one per row
+    (same convention as predict_tabular)
+    """
+    X_pred_preprocessed = preprocess_tabular(X_pred)
+
+    # sklearn classifiers' .predict returns hard 0/1 labels, so read the probability column instead;
+    # .predict is only used for Keras-style models that already output a probability
+    if hasattr(model, "predict_proba"):
+        unbleached_column = list(model.classes_).index(TABULAR_UNBLEACHED_LABEL)
+        pred = model.predict_proba(X_pred_preprocessed)[:, unbleached_column]
+    else:
+        pred = model.predict(X_pred_preprocessed)
+
+    return np.asarray(pred, dtype=np.float32).ravel()
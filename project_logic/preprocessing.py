@@ -4,6 +4,7 @@ import dill
 from pydantic import BaseModel
 from tensorflow.keras.preprocessing.image import img_to_array
 from PIL import Image
+from functools import lru_cache
 import io
 import os
 
@@ -30,6 +31,11 @@ class TabularInput(BaseModel):
     month_sin: float
     Turbidity: float
 
+
+# Column order expected by the tabular preprocessor
+TABULAR_COLUMNS = list(TabularInput.__annotations__)
+STRING_COLUMNS = [c for c, t in TabularInput.__annotations__.items() if t is str]
+
 def load_img(img_bytes: bytes):
 
     img = Image.open(io.BytesIO(img_bytes))
@@ -50,7 +56,9 @@ def load_img(img_bytes: bytes):
     return img
 
 
+@lru_cache(maxsize=1)
 def load_tabular_preproc():
+    # Cached: unpickling the preprocessor on every prediction dominated small batches
     preprocessor_path = os.path.join("models", "preproc_tabular.dill")
     with open(preprocessor_path, "rb") as f:
             preprocessor = dill.load(f)
@@ -63,3 +71,83 @@ def preprocess_tabular(X: pd.DataFrame = None):
     X_preprocessed = preprocessor.transform(X)
 
     return X_preprocessed
+
+
+
+#-----------------------BINARY_BATCH_INPUT--------------------
+
+def missing_tabular_columns(columns):
+    """
+    Return the TabularInput features absent from columns
+    """
+    return [c for c in TABULAR_COLUMNS if c not in columns]
+
+
+def mistyped_tabular_columns(kinds: dict):
+    """
+    Return the TabularInput features whose numpy dtype kind is wrong.
+    kinds maps column name -> dtype kind: float features need a numeric
+    kind ('f', 'i' or 'u'), string features need unicode ('U')
+    """
+    mistyped = []
+    for c in TABULAR_COLUMNS:
+        expected = "U" if c in STRING_COLUMNS else "fiu"
+        if kinds[c] not in expected:
+            mistyped.append(c)
+    return mistyped
+
+
+def iter_arrow_batches(reader, chunk_rows: int = 65536):
+    """
+    Yield DataFrames of at most chunk_rows rows from an open Arrow IPC
+    stream reader (pa.ipc.open_stream), one record batch at a time
+    """
+    for batch in reader:
+        # Slicing is zero-copy, so oversized sender batches are cheap to split
+        for start in range(0, batch.num_rows, chunk_rows):
+            yield batch.slice(start, chunk_rows).to_pandas()[TABULAR_COLUMNS]
+
+
+def read_npy_header(f):
+    """
+    Read the header of a seekable .npy file object and return (shape, dtype),
+    leaving f positioned at the start of the array data
+    """
+    version = np.lib.format.read_magic(f)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+
+    if fortran_order:
+        raise ValueError("Fortran-ordered .npy arrays are not supported")
+    if dtype.names is None or len(shape) != 1:
+        raise ValueError("Expected a 1-D structured .npy array with one field per feature")
+    if dtype.hasobject:
+        raise ValueError("Object fields are not supported in .npy input")
+
+    # Check the data section is complete before anything is scored
+    data_start = f.tell()
+    f.seek(0, 2)
+    data_size = f.tell() - data_start
+    f.seek(data_start)
+    if data_size < shape[0] * dtype.itemsize:
+        raise ValueError(
+            f"Truncated .npy payload: expected {shape[0] * dtype.itemsize} data bytes, got {data_size}"
+        )
+
+    return shape, dtype
+
+
+def iter_npy_batches(f, dtype, n_rows: int, chunk_rows: int = 65536):
+    """
+    Yield DataFrames of at most chunk_rows rows from the data section of a
+    structured .npy file object (see read_npy_header)
+    """
+    for start in range(0, n_rows, chunk_rows):
+        count = min(chunk_rows, n_rows - start)
+        buffer = f.read(count * dtype.itemsize)
+        if len(buffer) != count * dtype.itemsize:
+            raise ValueError("Truncated .npy payload")
+
+        yield pd.DataFrame(np.frombuffer(buffer, dtype=dtype, count=count))[TABULAR_COLUMNS]
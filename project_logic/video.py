@@ -0,0 +1,195 @@
+import math
+import time
+import cv2
+import numpy as np
+
+from project_logic.predict import IMAGE_SHAPE
+
+
+#-----------------------VIDEO_SETTINGS-------------------
+
+DEFAULT_SAMPLE_FPS = 2.0
+DEFAULT_SEGMENT_SECONDS = 10.0
+VIDEO_BATCH_SIZE = 32
+
+# Frames whose 64-bit dHash differs from the last kept frame by at most this many bits are skipped
+MAX_DUPLICATE_DISTANCE = 4
+
+
+#-----------------------FRAME_DECODING-------------------
+
+def video_duration(video_path: str):
+    """
+    Duration of a video in seconds from its container metadata, or None if unknown
+    """
+    capture = cv2.VideoCapture(video_path)
+    if not capture.isOpened():
+        raise ValueError(f"Could not open video {video_path}")
+
+    try:
+        video_fps = capture.get(cv2.CAP_PROP_FPS)
+        frame_count = capture.get(cv2.CAP_PROP_FRAME_COUNT)
+    finally:
+        capture.release()
+
+    if video_fps > 0 and frame_count > 0:
+        return frame_count / video_fps
+    return None
+
+
+def iter_sampled_frames(video_path: str, sample_fps: float = DEFAULT_SAMPLE_FPS):
+    """
+    Read a video one frame at a time and yield (timestamp_s, BGR frame)
+    for roughly sample_fps frames per second of footage.
+    Every frame still goes through grab(), which decodes it with the FFmpeg backend;
+    skipped frames are never retrieve()d (converted to BGR and copied out) or scored.
+    Without a usable FPS in the metadata, frames are picked by their CAP_PROP_POS_MSEC timestamp.
+    """
+    capture = cv2.VideoCapture(video_path)
+    if not capture.isOpened():
+        raise ValueError(f"Could not open video {video_path}")
+
+    video_fps = capture.get(cv2.CAP_PROP_FPS)
+    step = max(int(round(video_fps / sample_fps)), 1) if video_fps > 0 else None
+    next_sample_s = 0.0
+
+    try:
+        frame_index = 0
+        while capture.grab():
+            if step is not None:
+                sampled = frame_index % step == 0
+                timestamp = frame_index / video_fps
+            else:
+                timestamp = capture.get(cv2.CAP_PROP_POS_MSEC) / 1000
+                sampled = timestamp >= next_sample_s
+                if sampled:
+                    next_sample_s = timestamp + 1 / sample_fps
+            frame_index += 1
+
+            if sampled:
+                ok, frame = capture.retrieve()
+                if not ok:
+                    break
+                yield timestamp, frame
+    finally:
+        capture.release()
+
+
+def frame_hash(frame) -> int:
+    """
+    64-bit difference hash (dHash) of a BGR frame: cheap enough to run on
+    every sampled frame and robust to small camera shake and compression noise
+    """
+    small = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+def preprocess_frame(frame):
+    """
+    BGR frame -> (224, 224, 3) float32 RGB array, matching load_img
+    """
+    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    resized = cv2.resize(rgb, IMAGE_SHAPE[:2], interpolation=cv2.INTER_AREA)
+    return resized.astype(np.float32)
+
+
+#-----------------------VIDEO_SCORING-------------------
+
+def score_video(model=None,
+                video_path: str = None,
+                sample_fps: float = DEFAULT_SAMPLE_FPS,
+                segment_seconds: float = DEFAULT_SEGMENT_SECONDS,
+                batch_size: int = VIDEO_BATCH_SIZE,
+                max_duplicate_distance: int = MAX_DUPLICATE_DISTANCE):
+    """
+    Score a survey video with the image model and return a per-segment bleaching timeline
+    covering the whole video. Only the current batch of frames is held in memory, whatever
+    the video length. Segments where every sampled frame was a near-duplicate of an earlier
+    one inherit the last scored probability and are marked carried_forward; segments with
+    no sampled frame at all report probability_bleached and predicted_class as None.
+    """
+    start = time.perf_counter()
+    duration = video_duration(video_path)
+
+    # Per-segment running totals: [sum of probability_bleached, frames scored, frames skipped]
+    segments = {}
+    stats = {"frames_sampled": 0, "frames_scored": 0, "frames_skipped_duplicate": 0}
+    batch_images, batch_segments = [], []
+    last_hash = None
+    last_timestamp = 0.0
+
+    def flush():
+        prob_unbleached = np.asarray(model.predict(np.stack(batch_images))).reshape(-1)
+        for segment, prob in zip(batch_segments, prob_unbleached):
+            segments[segment][0] += 1 - float(prob)
+            segments[segment][1] += 1
+        stats["frames_scored"] += len(batch_images)
+        batch_images.clear()
+        batch_segments.clear()
+
+    for timestamp, frame in iter_sampled_frames(video_path, sample_fps):
+        stats["frames_sampled"] += 1
+        last_timestamp = timestamp
+        segment = int(timestamp // segment_seconds)
+        totals = segments.setdefault(segment, [0.0, 0, 0])
+
+        current_hash = frame_hash(frame)
+        if last_hash is not None and bin(current_hash ^ last_hash).count("1") <= max_duplicate_distance:
+            totals[2] += 1
+            stats["frames_skipped_duplicate"] += 1
+            continue
+        last_hash = current_hash
+
+        batch_images.append(preprocess_frame(frame))
+        batch_segments.append(segment)
+        if len(batch_images) == batch_size:
+            flush()
+
+    if batch_images:
+        flush()
+
+    #Report classes & probabilities per segment
+    class_names = ['Bleached', 'Unbleached']
+
+    # Without container metadata, the video lasts until one sampling interval after the last sampled frame;
+    # metadata that undercounts the frames is stretched to cover every sampled timestamp
+    if duration is None:
+        duration = last_timestamp + 1 / sample_fps if stats["frames_sampled"] else 0.0
+    else:
+        duration = max(duration, last_timestamp)
+    n_segments = math.ceil(duration / segment_seconds)
+    if segments:
+        n_segments = max(n_segments, max(segments) + 1)
+
+    timeline = []
+    last_prob_bleached = None
+    for segment in range(n_segments):
+        total_bleached, n_scored, n_skipped = segments.get(segment, (0.0, 0, 0))
+        carried_forward = False
+        if n_scored:
+            prob_bleached = last_prob_bleached = total_bleached / n_scored
+        elif n_skipped:
+            prob_bleached = last_prob_bleached
+            carried_forward = True
+        else:
+            prob_bleached = None
+
+        timeline.append({
+            "start_s": segment * segment_seconds,
+            "end_s": min((segment + 1) * segment_seconds, duration),
+            "frames_scored": n_scored,
+            "frames_skipped_duplicate": n_skipped,
+            "probability_bleached": prob_bleached,
+            "predicted_class": None if prob_bleached is None else class_names[int(prob_bleached < 0.5)],
+            "carried_forward": carried_forward,
+        })
+
+    elapsed = time.perf_counter() - start
+    stats["elapsed_s"] = elapsed
+    stats["sampled_frames_per_s"] = stats["frames_sampled"] / elapsed if elapsed else 0.0
+    stats["scored_frames_per_s"] = stats["frames_scored"] / elapsed if elapsed else 0.0
+
+    print('✅ Video prediction ready')
+
+    return {"timeline": timeline, "stats": stats}
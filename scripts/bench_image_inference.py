@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Compare the Keras model.predict path against CompiledImageModel: startup
+time, first-request latency after the model is ready, and steady-state
+per-sample latency at batch sizes 1 and 32.
+
+Usage (from the project root, with models/ in place):
+    python scripts/bench_image_inference.py [--xla]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from tensorflow.keras.models import load_model
+from project_logic.predict import CompiledImageModel, IMAGE_SHAPE
+
+
+def per_sample_ms(predict, images, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        predict(images)
+    return (time.perf_counter() - start) / (repeats * len(images)) * 1e3
+
+
+def bench(name, build, repeats):
+    start = time.perf_counter()
+    predict = build()
+    startup_s = time.perf_counter() - start
+
+    single = np.random.rand(1, *IMAGE_SHAPE).astype(np.float32)
+    batch = np.random.rand(32, *IMAGE_SHAPE).astype(np.float32)
+
+    start = time.perf_counter()
+    predict(single)
+    first_ms = (time.perf_counter() - start) * 1e3
+
+    # One untimed call per shape so steady state excludes any remaining tracing
+    predict(batch)
+    batch1_ms = per_sample_ms(predict, single, repeats)
+    batch32_ms = per_sample_ms(predict, batch, max(repeats // 8, 1))
+
+    print(f"{name:<22} {startup_s:>10.2f} {first_ms:>16.1f} {batch1_ms:>14.2f} {batch32_ms:>14.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model-path", default=os.path.join("models", "baseline_model.keras"))
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--xla", action="store_true", help="also benchmark with XLA JIT")
+    args = parser.parse_args()
+
+    def keras_predict():
+        model = load_model(args.model_path)
+        return lambda images: model.predict(images, verbose=0)
+
+    def compiled_predict(jit_compile):
+        def build():
+            model = CompiledImageModel(load_model(args.model_path), jit_compile=jit_compile)
+            model.warmup()
+            return model.predict
+        return build
+
+    print(f"{'path':<22} {'startup s':>10} {'first request ms':>16} {'ms/sample @1':>14} {'ms/sample @32':>14}")
+    bench("model.predict", keras_predict, args.repeats)
+    bench("compiled", compiled_predict(False), args.repeats)
+    if args.xla:
+        bench("compiled + XLA", compiled_predict(True), args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Compare rows/sec of the JSON /predict/tabular endpoint against the binary
+/predict/tabular/batch endpoint (Arrow IPC stream and .npy).
+
+The JSON endpoint only takes one row per request, so it is timed on at most
+--json-max-rows rows and its rows/sec is reported from that sample.
+
+Usage (from the project root, with models/ in place):
+    python scripts/bench_tabular_batch.py --rows 1000 100000 1000000
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi.testclient import TestClient
+from api.fast import app, ARROW_STREAM_TYPE, NPY_TYPE
+from project_logic.preprocessing import TabularInput
+
+
+OCEANS = ["Atlantic", "Pacific", "Indian", "Red Sea", "Arabian Gulf"]
+REALMS = ["Central Indo-Pacific", "Eastern Indo-Pacific", "Western Indo-Pacific", "Tropical Atlantic"]
+
+
+def make_rows(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name, annotation in TabularInput.__annotations__.items():
+        if annotation is str:
+            choices = OCEANS if name == "Ocean_Name" else REALMS
+            columns[name] = rng.choice(choices, size=n_rows)
+        else:
+            columns[name] = rng.normal(size=n_rows)
+    return pd.DataFrame(columns)
+
+
+def bench_json(client, X: pd.DataFrame) -> float:
+    records = X.to_dict(orient="records")
+    start = time.perf_counter()
+    for record in records:
+        client.post("/predict/tabular", json=record).raise_for_status()
+    return len(records) / (time.perf_counter() - start)
+
+
+def bench_arrow(client, X: pd.DataFrame) -> float:
+    start = time.perf_counter()
+    table = pa.Table.from_pandas(X, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table, max_chunksize=65536)
+    response = client.post(
+        "/predict/tabular/batch",
+        content=sink.getvalue().to_pybytes(),
+        headers={"Content-Type": ARROW_STREAM_TYPE},
+    )
+    response.raise_for_status()
+    probs = pa.ipc.open_stream(response.content).read_all()
+    assert probs.num_rows == len(X)
+    return len(X) / (time.perf_counter() - start)
+
+
+def bench_npy(client, X: pd.DataFrame) -> float:
+    start = time.perf_counter()
+    buffer = io.BytesIO()
+    # Fixed-width strings keep the .npy pickle-free
+    string_dtypes = {c: "U32" for c in X.select_dtypes(exclude="number").columns}
+    np.save(buffer, X.to_records(index=False, column_dtypes=string_dtypes), allow_pickle=False)
+    response = client.post(
+        "/predict/tabular/batch",
+        content=buffer.getvalue(),
+        headers={"Content-Type": NPY_TYPE},
+    )
+    response.raise_for_status()
+    probs = np.load(io.BytesIO(response.content))
+    assert probs.shape == (len(X), 2)
+    return len(X) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--json-max-rows", type=int, default=2_000)
+    args = parser.parse_args()
+
+    client = TestClient(app)
+
+    print(f"{'rows':>10} {'json rows/s':>14} {'arrow rows/s':>14} {'npy rows/s':>14}")
+    for n_rows in args.rows:
+        X = make_rows(n_rows)
+
+        json_rate = bench_json(client, X.head(args.json_max_rows))
+        arrow_rate = bench_arrow(client, X)
+        npy_rate = bench_npy(client, X)
+        print(f"{n_rows:>10} {json_rate:>14,.0f} {arrow_rate:>14,.0f} {npy_rate:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
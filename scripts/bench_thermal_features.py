@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Check the vectorized and incremental thermal-stress features against a
+straightforward per-site, per-day reference, and time all three.
+
+Usage (from the project root):
+    python scripts/bench_thermal_features.py --sites 500 --days 365
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from project_logic.features import (
+    DHW_WINDOW_DAYS,
+    HOTSPOT_THRESHOLD,
+    ThermalStressEngine,
+    thermal_stress_features,
+)
+
+
+def reference_dhw(sst, baseline):
+    # Recompute the full 12-week window for every site and day; baseline has the same shape as sst
+    n_sites, n_days = sst.shape
+    dhw = np.zeros((n_sites, n_days))
+    for site in range(n_sites):
+        for day in range(n_days):
+            total = 0.0
+            for past in range(max(0, day - DHW_WINDOW_DAYS + 1), day + 1):
+                anomaly = sst[site, past] - baseline[site, past]
+                if anomaly >= HOTSPOT_THRESHOLD:
+                    total += anomaly
+            dhw[site, day] = total / 7
+    return dhw
+
+
+def make_series(n_sites, n_days, seed=0):
+    rng = np.random.default_rng(seed)
+    # Seasonal daily climatology per site; MMM sits near its warmest month
+    site_mean = rng.uniform(298, 302, size=n_sites)
+    seasonal = 1.5 * np.sin(2 * np.pi * np.arange(n_days) / 365)
+    clim_sst = site_mean[:, None] + seasonal
+    mmm = site_mean + 1.5 + rng.uniform(-0.5, 0.5, size=n_sites)
+    sst = clim_sst + rng.normal(scale=0.8, size=(n_sites, n_days))
+    dates = np.datetime64("2016-01-01") + np.arange(n_days)
+    return sst, clim_sst, mmm, dates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sites", type=int, default=500)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--reference-sites", type=int, default=20)
+    args = parser.parse_args()
+
+    sst, clim_sst, mmm, dates = make_series(args.sites, args.days)
+
+    start = time.perf_counter()
+    vectorized = thermal_stress_features(sst, clim_sst, mmm, dates)
+    vectorized_s = time.perf_counter() - start
+
+    # Warm up on the first half of the series, then stream in the rest day by day
+    split = args.days // 2
+    engine = ThermalStressEngine.from_history(sst[:, :split], clim_sst[:, :split], mmm)
+    start = time.perf_counter()
+    for day in range(split, args.days):
+        daily = engine.update(sst[:, day], clim_sst[:, day], dates[day])
+        for name, values in daily.items():
+            np.testing.assert_allclose(values, vectorized[name][:, day], atol=1e-9, err_msg=name)
+    incremental_s = (time.perf_counter() - start) / max(args.days - split, 1)
+
+    n_ref = min(args.reference_sites, args.sites)
+    start = time.perf_counter()
+    ssta_dhw = reference_dhw(sst[:n_ref], clim_sst[:n_ref])
+    tsa_dhw = reference_dhw(sst[:n_ref], np.broadcast_to(mmm[:n_ref, None], (n_ref, args.days)))
+    reference_s = time.perf_counter() - start
+    np.testing.assert_allclose(vectorized["SSTA_DHW"][:n_ref], ssta_dhw, atol=1e-9)
+    np.testing.assert_allclose(vectorized["TSA_DHW"][:n_ref], tsa_dhw, atol=1e-9)
+
+    print("✅ Vectorized, incremental and reference features match")
+    print(f"reference:   {reference_s / n_ref * 1e3:10.3f} ms per site ({args.days} days)")
+    print(f"vectorized:  {vectorized_s / args.sites * 1e3:10.3f} ms per site ({args.days} days)")
+    print(f"incremental: {incremental_s / args.sites * 1e6:10.3f} µs per site per new day")
+
+
+if __name__ == "__main__":
+    main()
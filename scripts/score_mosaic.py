@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Score a reef orthomosaic tile by tile and save a bleaching-probability heatmap.
+
+Usage (from the project root, with models/ in place):
+    python scripts/score_mosaic.py reef_ortho.tif --heatmap reef_heatmap.npy --png reef_heatmap.png
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from project_logic.predict import load_image_model_trained
+from project_logic.mosaic import DEFAULT_TILE_STRIDE, MOSAIC_BATCH_SIZE, MOSAIC_WORKERS, score_mosaic
+
+
+def save_heatmap_png(heatmap, path):
+    # Red = bleached, green = unbleached, transparent = skipped background tiles
+    rgba = np.zeros((*heatmap.shape, 4), dtype=np.uint8)
+    scored = ~np.isnan(heatmap)
+    rgba[scored, 0] = (heatmap[scored] * 255).astype(np.uint8)
+    rgba[scored, 1] = ((1 - heatmap[scored]) * 255).astype(np.uint8)
+    rgba[scored, 3] = 255
+    Image.fromarray(rgba, mode="RGBA").save(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("mosaic_path", help="8-bit GeoTIFF (or other GDAL raster) or a (height, width, 1|3|4) uint8 .npy array")
+    parser.add_argument("--stride", type=int, default=DEFAULT_TILE_STRIDE)
+    parser.add_argument("--batch-size", type=int, default=MOSAIC_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=MOSAIC_WORKERS)
+    parser.add_argument("--heatmap", help="save the heatmap as .npy")
+    parser.add_argument("--png", help="save the heatmap as a colour .png")
+    args = parser.parse_args()
+
+    result = score_mosaic(
+        model=load_image_model_trained(),
+        mosaic_path=args.mosaic_path,
+        stride=args.stride,
+        batch_size=args.batch_size,
+        workers=args.workers,
+    )
+
+    if args.heatmap:
+        np.save(args.heatmap, result["heatmap"])
+    if args.png:
+        save_heatmap_png(result["heatmap"], args.png)
+
+    summary, stats = result["summary"], result["stats"]
+    if summary["percent_bleached"] is None:
+        print("No reef tiles found: every tile was skipped as background")
+    else:
+        print(
+            f"{summary['percent_bleached']:.1f}% of scored reef area bleached"
+            f" (area-weighted mean probability {summary['mean_probability_bleached']:.3f},"
+            f" {summary['scored_area_px'] / summary['mosaic_area_px'] * 100:.1f}% of the mosaic scored)"
+        )
+    print(
+        f"{stats['tiles_scored']} tiles scored, {stats['tiles_skipped_background']} skipped as background"
+        f" in {stats['elapsed_s']:.1f}s ({stats['tiles_per_s']:.1f} tiles/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Score an underwater survey video and print its per-segment bleaching timeline.
+
+Usage (from the project root, with models/ in place):
+    python scripts/score_video.py transect.mp4 --sample-fps 2 --segment-seconds 10
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from project_logic.predict import load_image_model_trained
+from project_logic.video import (
+    DEFAULT_SAMPLE_FPS,
+    DEFAULT_SEGMENT_SECONDS,
+    MAX_DUPLICATE_DISTANCE,
+    VIDEO_BATCH_SIZE,
+    score_video,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("video_path")
+    parser.add_argument("--sample-fps", type=float, default=DEFAULT_SAMPLE_FPS)
+    parser.add_argument("--segment-seconds", type=float, default=DEFAULT_SEGMENT_SECONDS)
+    parser.add_argument("--batch-size", type=int, default=VIDEO_BATCH_SIZE)
+    parser.add_argument("--max-duplicate-distance", type=int, default=MAX_DUPLICATE_DISTANCE)
+    parser.add_argument("--json", action="store_true", help="print the full result as JSON")
+    args = parser.parse_args()
+
+    result = score_video(
+        model=load_image_model_trained(),
+        video_path=args.video_path,
+        sample_fps=args.sample_fps,
+        segment_seconds=args.segment_seconds,
+        batch_size=args.batch_size,
+        max_duplicate_distance=args.max_duplicate_distance,
+    )
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"{'segment':>17} {'scored':>7} {'skipped':>8} {'p(bleached)':>12}  class")
+    for segment in result["timeline"]:
+        prob = segment["probability_bleached"]
+        prob_text = "-" if prob is None else f"{prob:.3f}"
+        if segment["carried_forward"]:
+            prob_text = f"*{prob_text}"
+        print(
+            f"{segment['start_s']:>7.1f}s-{segment['end_s']:>7.1f}s"
+            f" {segment['frames_scored']:>7} {segment['frames_skipped_duplicate']:>8}"
+            f" {prob_text:>12}  {segment['predicted_class'] or '-'}"
+        )
+
+    stats = result["stats"]
+    if any(segment["carried_forward"] for segment in result["timeline"]):
+        print("* carried forward: every sampled frame in the segment was a duplicate")
+    print(
+        f"\n{stats['frames_sampled']} frames sampled, {stats['frames_scored']} scored,"
+        f" {stats['frames_skipped_duplicate']} skipped as duplicates in {stats['elapsed_s']:.1f}s"
+        f" ({stats['sampled_frames_per_s']:.1f} sampled frames/s,"
+        f" {stats['scored_frames_per_s']:.1f} scored frames/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()